@@ -1,24 +1,54 @@
 import feedparser
 import html
 import argparse
+import asyncio
 import json
 import os
 import base64
+import functools
+import hashlib
 import bleach
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+import re
+import sys
+import threading
+import time
+from io import BytesIO
+from xml.etree import ElementTree
 from pathlib import Path
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlparse
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from textwrap import dedent
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 SCOPES = ['https://www.googleapis.com/auth/gmail.send']
+GMAIL_BATCH_SIZE = 100
+GMAIL_SEND_URL = "https://gmail.googleapis.com/gmail/v1/users/me/messages/send"
+# Responses on which a send is retried with exponential backoff (rate limits, server errors)
+GMAIL_RETRY_STATUSES = {429, 500, 502, 503, 504}
+GMAIL_MAX_RETRIES = 3
 
 # Define which HTML tags, attributes, and styles you allow:
 ALLOWED_TAGS = [
@@ -34,126 +64,620 @@ ALLOWED_ATTRIBUTES = {
 }
 ALLOWED_PROTOCOLS = ['http', 'https', 'mailto']
 
-def get_reading_time_from_text(text):
-    """Estimate reading time based on word count (assumes 200 wpm)."""
-    words = len(text.split())
-    return round(words / 200)
+USER_AGENT = "rss-to-email (+https://github.com/silekoch/rss-to-email)"
+
+# Shared HTTP session, so connections to the same host are pooled and kept alive
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = USER_AGENT
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=64)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+# Matches <script> and <style> blocks, whose content isn't text a reader sees
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+# Matches HTML tags, used to strip markup before counting words
+_TAG_RE = re.compile(r"<[^>]+>")
+# Matches a single word, i.e. a run of non-whitespace characters
+_WORD_RE = re.compile(r"\S+")
+# The same patterns for raw response bodies, which we strip of markup before decoding them
+_SCRIPT_STYLE_BYTES_RE = re.compile(_SCRIPT_STYLE_RE.pattern.encode(), _SCRIPT_STYLE_RE.flags & ~re.UNICODE)
+_TAG_BYTES_RE = re.compile(_TAG_RE.pattern.encode())
+_SCRIPT_STYLE_OPEN_BYTES_RE = re.compile(rb"<(script|style)\b", re.IGNORECASE)
+_SCRIPT_STYLE_CLOSE_BYTES_RE = re.compile(rb"</(script|style)\s*>", re.IGNORECASE)
+
+# Article pages are downloaded in chunks of this size until the page ends or
+# READING_TIME_MAX_WORDS words were counted; longer articles are capped there
+READ_CHUNK_SIZE = 64 * 1024
+READING_TIME_MAX_WORDS = 5000
+# Descriptions with more words than this are taken as the article text for the reading time.
+# Shorter ones would round to 0 minutes, so their article page is fetched instead.
+DESCRIPTION_MIN_WORDS = 100
+
+# Namespaced RSS and Atom elements we read in the lxml fast path
+_CONTENT_ENCODED_TAG = "{http://purl.org/rss/1.0/modules/content/}encoded"
+_DC_CREATOR_TAG = "{http://purl.org/dc/elements/1.1/}creator"
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_ATOM_ENTRY_TAG = _ATOM_NS + "entry"
+_XML_BASE_ATTR = "{http://www.w3.org/XML/1998/namespace}base"
+_XHTML_NS = "{http://www.w3.org/1999/xhtml}"
+
+# HTML body of the article emails
+_EMAIL_TEMPLATE = (
+    "<h2>{title}</h2>"
+    "<p><b>Author:</b> {author}<br>"
+    "<a href='{link}'>{link}</a><br>"
+    "<i>Estimated Reading Time: {rt} min</i></p>"
+    "{body}"
+)
+_EMAIL_BODY = "<div>{}</div>".format
+
+# bleach Cleaners are not thread-safe, so we keep one per thread
+_CLEANER = threading.local()
+
+def _count_words(text):
+    """Count the words of a text (str or bytes) without building a list of them."""
+    if isinstance(text, bytes):
+        # Decode, so non-ASCII whitespace like U+00A0 separates words just like in a str.
+        # Bytes that aren't UTF-8 become replacement characters, which still count as word characters.
+        text = text.decode("utf-8", "replace")
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+def extract_text(html_text):
+    """
+    Return the readable text of an HTML string, without markup, scripts and styles.
+    Also accepts bytes, which are processed as-is and returned as bytes.
+    """
+    if isinstance(html_text, bytes):
+        return _TAG_BYTES_RE.sub(b" ", _SCRIPT_STYLE_BYTES_RE.sub(b" ", html_text))
+    return _TAG_RE.sub(" ", _SCRIPT_STYLE_RE.sub(" ", html_text))
+
+def _fast_word_count(html_text):
+    """Count the words of an HTML string, ignoring the markup."""
+    return _count_words(extract_text(html_text))
+
+def get_reading_time_from_html(html_text):
+    """Estimate reading time of an HTML str or bytes based on its word count (assumes 200 wpm)."""
+    return round(_fast_word_count(html_text) / 200)
+
+def _count_complete_words(data):
+    """
+    Count the words of the part of an HTML byte buffer that can't change with more data,
+    i.e. up to the last complete tag and outside an unfinished script or style block.
+    Returns the word count and the remaining bytes, to be prepended to the next chunk.
+    """
+    cut = data.rfind(b">") + 1
+    last_open = None
+    for last_open in _SCRIPT_STYLE_OPEN_BYTES_RE.finditer(data, 0, cut):
+        pass
+    if last_open is not None and not _SCRIPT_STYLE_CLOSE_BYTES_RE.search(data, last_open.end(), cut):
+        cut = last_open.start()
+    return _fast_word_count(data[:cut]), data[cut:]
+
+class _StreamingWordCount:
+    """Counts the words of an HTML page that is downloaded in chunks."""
+
+    def __init__(self):
+        self.words = 0
+        self._pending = b""
+
+    def feed(self, chunk):
+        """Count the words of the next chunk. Returns True once READING_TIME_MAX_WORDS were counted."""
+        count, self._pending = _count_complete_words(self._pending + chunk)
+        self.words += count
+        return self.words >= READING_TIME_MAX_WORDS
+
+    def reading_time(self):
+        """Estimate the reading time of the page fed so far (assumes 200 wpm)."""
+        words = self.words + _fast_word_count(self._pending)
+        return round(min(words, READING_TIME_MAX_WORDS) / 200)
 
 def get_reading_time_from_url(url):
-    """Estimate reading time based on word count from the article URL."""
+    """
+    Estimate reading time based on word count from the article URL. The page is
+    streamed and the download stops once READING_TIME_MAX_WORDS words were counted.
+    """
     try:
-        response = requests.get(url, timeout=5)
-        soup = BeautifulSoup(response.text, "html.parser")
-        text = soup.get_text()
-        return get_reading_time_from_text(text)
+        with _SESSION.get(url, timeout=5, stream=True) as response:
+            counter = _StreamingWordCount()
+            for chunk in response.iter_content(READ_CHUNK_SIZE):
+                if counter.feed(chunk):
+                    break
+        return counter.reading_time()
     except:
         return "Unknown"
 
+def _feed_state(value):
+    """
+    Return the stored state of a feed as a dict. Older versions stored only
+    the list of seen links, which we treat as a state without cache headers.
+    """
+    if isinstance(value, list):
+        return {"seen": value, "etag": None, "modified": None}
+    return value or {"seen": [], "etag": None, "modified": None}
+
+def _load_json(filename):
+    """Load a JSON object from filename; missing or broken files load as an empty dict."""
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, "rb") as f:
+        data = f.read()
+    try:
+        loaded = orjson.loads(data) if orjson is not None else json.loads(data)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(loaded, dict):
+        return {}
+    return loaded
+
+def _save_json(data, filename, pretty=False):
+    """
+    Save data as JSON. The file is written to a temporary file first and then
+    swapped in, so an interrupted run can't truncate it.
+    """
+    if orjson is not None:
+        encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    else:
+        encoded = json.dumps(data, indent=2 if pretty else None).encode("utf-8")
+
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "wb") as f:
+        f.write(encoded)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
+
 def load_seen_articles(filename="seen_articles.json"):
     """
     Load the dictionary of seen articles:
     {
-      "feed_url": ["link1", "link2", ...],
-      "another_feed_url": [...]
+      "feed_url": {"seen": ["link1", "link2", ...], "etag": ..., "modified": ..., "digest": ...},
+      "another_feed_url": {...}
     }
+    Files written by older versions, which stored only the list of links per
+    feed, are converted to this format.
     """
-    if os.path.exists(filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return {}
-    return {}
+    seen_articles = _load_json(filename)
+    return {feed_url: _feed_state(value) for feed_url, value in seen_articles.items()}
 
-def save_seen_articles(seen_articles, filename="seen_articles.json"):
+def save_seen_articles(seen_articles, filename="seen_articles.json", pretty=False):
     """Save the dictionary of seen articles."""
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(seen_articles, f, indent=2)
+    _save_json(seen_articles, filename, pretty=pretty)
 
-def fetch_rss_articles(feed_urls, seen_articles, max_articles_per_feed):
+def _resolve_base(base_url, elements):
+    """Apply the xml:base attributes of the given elements, outermost first, to base_url."""
+    for element in elements:
+        xml_base = element.get(_XML_BASE_ATTR)
+        if xml_base:
+            base_url = urljoin(base_url, xml_base.strip())
+    return base_url
+
+def _xhtml_to_string(element):
+    """Serialize an element of Atom xhtml content as HTML without namespace prefixes."""
+    if not isinstance(element, ElementTree.Element):
+        return etree.tostring(element, encoding="unicode")
+    # The stdlib would prefix every XHTML tag with "html:", which bleach then strips,
+    # so drop the namespace from the tags. The element isn't used after this anyway.
+    for descendant in element.iter():
+        if isinstance(descendant.tag, str) and descendant.tag.startswith(_XHTML_NS):
+            descendant.tag = descendant.tag[len(_XHTML_NS):]
+    return ElementTree.tostring(element, encoding="unicode")
+
+def _atom_text(element, tag):
     """
-    Fetch articles from multiple RSS feeds and filter out those that are already seen.
-    Each feed is tracked separately. We rotate out the oldest link if we exceed the max size.
+    Return the text of an Atom text construct like <title>. xhtml ones hold markup
+    that findtext can't read, so raise for those and let feedparser handle the feed.
+    """
+    child = element.find(tag)
+    if child is None:
+        return ""
+    if child.get("type") == "xhtml":
+        raise ValueError(f"unsupported xhtml {tag}")
+    return child.text or ""
+
+def _atom_entry(element, base_url):
+    """
+    Extract a feedparser-like entry dict from an Atom <entry> element.
+    Relative links are resolved against base_url, the base URL of the element.
+    """
+    entry = {
+        "title": _atom_text(element, _ATOM_NS + "title").strip(),
+        "link": "",
+        "description": _atom_text(element, _ATOM_NS + "summary"),
+    }
+    for link in element.iterfind(_ATOM_NS + "link"):
+        if link.get("rel", "alternate") == "alternate":
+            href = (link.get("href") or "").strip()
+            if href:
+                entry["link"] = urljoin(_resolve_base(base_url, (link,)), href)
+            break
+    author = element.findtext(f"{_ATOM_NS}author/{_ATOM_NS}name")
+    if author:
+        entry["author"] = author.strip()
+    content = element.find(_ATOM_NS + "content")
+    if content is not None:
+        if content.get("type") == "xhtml":
+            value = "".join(_xhtml_to_string(child) for child in content)
+        else:
+            value = content.text
+        if value:
+            entry["content"] = [{"value": value}]
+    return entry
+
+def _rss_item(element, base_url):
+    """
+    Extract a feedparser-like entry dict from an RSS <item> element.
+    Relative links are resolved against base_url, the base URL of the element.
+    """
+    link = (element.findtext("link") or "").strip()
+    if not link:
+        # Like feedparser, use the guid if the item has no link and the guid is a permalink
+        guid = element.find("guid")
+        if guid is not None and guid.get("isPermaLink", "true").strip().lower() != "false":
+            link = (guid.text or "").strip()
+    entry = {
+        "title": (element.findtext("title") or "").strip(),
+        "link": urljoin(base_url, link) if link else "",
+        "description": element.findtext("description") or "",
+    }
+    author = element.findtext(_DC_CREATOR_TAG) or element.findtext("author")
+    if author:
+        entry["author"] = author.strip()
+    content = element.findtext(_CONTENT_ENCODED_TAG)
+    if content:
+        entry["content"] = [{"value": content}]
+    return entry
+
+def _fast_parse(feed_bytes, base_url):
+    """
+    Stream the items of an RSS 2.0 or Atom feed with lxml, yielding feedparser-like
+    entry dicts with only the fields we use. Parsing stops as soon as the caller
+    stops iterating, so we never build more of the feed than we need.
+    Raises if lxml can't parse the feed.
+    """
+    context = etree.iterparse(
+        BytesIO(feed_bytes), events=("end",), tag=("item", _ATOM_ENTRY_TAG), resolve_entities=False
+    )
+    for _, element in context:
+        # Entities declared in a DTD (e.g. &eacute; in RSS 0.91) stay unresolved entity nodes,
+        # which findtext silently stops at. Let feedparser handle those feeds.
+        if next(element.iter(etree.Entity), None) is not None:
+            raise ValueError("feed uses DTD entities")
+        element_base = _resolve_base(base_url, [*reversed(list(element.iterancestors())), element])
+        if element.tag == _ATOM_ENTRY_TAG:
+            yield _atom_entry(element, element_base)
+        else:
+            yield _rss_item(element, element_base)
+        # Free the parsed element and its already processed siblings
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+def _fast_parse_stdlib(feed_bytes, base_url):
+    """
+    Same as _fast_parse, for when lxml isn't installed. The stdlib parser can't filter
+    by tag or walk up the tree, so we keep track of the open elements ourselves.
     """
+    open_elements = []
+    for event, element in ElementTree.iterparse(BytesIO(feed_bytes), events=("start", "end")):
+        if event == "start":
+            open_elements.append(element)
+            continue
+        open_elements.pop()
+        if element.tag == _ATOM_ENTRY_TAG:
+            yield _atom_entry(element, _resolve_base(base_url, [*open_elements, element]))
+        elif element.tag == "item":
+            yield _rss_item(element, _resolve_base(base_url, [*open_elements, element]))
+        else:
+            continue
+        # Free the parsed element
+        if open_elements:
+            open_elements[-1].remove(element)
+
+def _iter_entries(feed_url, feed_bytes, response_headers):
+    """
+    Iterate over the entries of a feed, using the streaming fast path where possible and
+    falling back to feedparser for anything it doesn't handle (RSS 1.0, broken XML, ...).
+    """
+    fast_parse = _fast_parse if etree is not None else _fast_parse_stdlib
+    # Both parsers only get the body, relative links are resolved against this URL
+    base_url = urljoin(feed_url, response_headers.get("Content-Location", ""))
+    yielded = 0
+    try:
+        for entry in fast_parse(feed_bytes, base_url):
+            # feedparser knows more ways to find an entry's link, let it take over
+            if not entry["link"]:
+                raise ValueError(f"no link found for entry {entry['title']!r}")
+            yielded += 1
+            yield entry
+        if yielded:
+            return
+    except Exception as e:
+        logging.debug(f"Fast feed parsing failed, falling back to feedparser: {e}")
+    # Hand feedparser the response headers for the charset, and the base URL for relative
+    # links. It expects lowercase header names.
+    headers = {name.lower(): value for name, value in response_headers.items()}
+    headers["content-location"] = base_url
+    parsed = feedparser.parse(feed_bytes, response_headers=headers)
+    # Skip the entries the fast path already produced before it failed
+    yield from islice(parsed.entries, yielded, None)
+
+def _conditional_headers(feed_state):
+    """Return the headers for a conditional GET, so unchanged feeds come back as an empty 304."""
+    headers = {}
+    if feed_state.get("etag"):
+        headers["If-None-Match"] = feed_state["etag"]
+    if feed_state.get("modified"):
+        headers["If-Modified-Since"] = feed_state["modified"]
+    return headers
+
+def _parse_feed(feed_url, feed_state, feed_bytes, response_headers, max_articles_per_feed):
+    """
+    Parse a downloaded RSS feed and collect the entries we haven't seen yet.
+    Returns a (feed_url, new_articles, new_feed_state) tuple and doesn't touch shared state.
+    """
+    # Some servers ignore conditional GETs, so also skip parsing if the body didn't change
+    digest = hashlib.blake2b(feed_bytes, digest_size=16).hexdigest()
+    if digest == feed_state.get("digest"):
+        return feed_url, [], feed_state
+
+    seen_list = feed_state["seen"]
+    seen_set = set(seen_list)
+
+    entries = _iter_entries(feed_url, feed_bytes, response_headers)
+    feed_domain = urlparse(feed_url).netloc  # Extract domain from feed URL
+
     articles = []
+    new_seen_articles = []
+    for entry in islice(entries, max_articles_per_feed):
+        entry_get = entry.get
+        link = entry_get("link")
 
-    for feed_url in feed_urls:
-        # Ensure this feed key exists in seen_articles
-        if feed_url not in seen_articles:
-            seen_articles[feed_url] = []
-
-        feed = feedparser.parse(feed_url)
-        feed_domain = urlparse(feed_url).netloc  # Extract domain from feed URL
-
-        new_seen_articles = []
-        for entry in feed.entries[:max_articles_per_feed]:
-            # Check if we've already seen this link for this feed
-            if entry.link in seen_articles[feed_url]:
-                # If yes, we assume we've seen all the rest as well
-                break
-
-            # Collect full content if available; otherwise, fallback
-            content_list = entry.get("content", [])
+        # Entries without a link can't be tracked, e.g. from a truncated feed
+        if not link:
+            continue
+
+        # Check if we've already seen this link for this feed
+        if link in seen_set:
+            # If yes, we assume we've seen all the rest as well
+            break
+
+        # Collect full content if available; otherwise, fallback
+        content_list = entry_get("content") or ()
+        content = ""
+        if len(content_list) == 1:
+            # The common case, reuse the entry's string instead of building a joined copy
+            content = content_list[0].get("value", "").strip()
+        elif content_list:
             content = " ".join(item.get("value", "") for item in content_list).strip()
-            description = entry.get("description", "")
 
-            if content:
-                soup = BeautifulSoup(content, "html.parser")
-                text = soup.get_text()
-                reading_time = get_reading_time_from_text(text)
+        if content:
+            reading_time = get_reading_time_from_html(content)
+        else:
+            content = entry_get("description", "")
+            words = _fast_word_count(content)
+            if words > DESCRIPTION_MIN_WORDS:
+                reading_time = round(words / 200)
             else:
-                reading_time = get_reading_time_from_url(entry.link)
+                # Filled in later from the article URL, see fetch_rss_articles
+                reading_time = None
 
-            author = entry.get("author", feed_domain)  # Use domain if no author
-            articles.append({
-                "title": entry.title,
-                "link": entry.link,
-                "reading_time": reading_time,
-                "author": author,
-                "content": content if content else description,
-            })
+        author = entry_get("author", feed_domain)  # Use domain if no author
+        articles.append({
+            "title": entry_get("title", ""),
+            "link": link,
+            "reading_time": reading_time,
+            "author": author,
+            "content": content,
+        })
 
-            new_seen_articles.append(entry.link)
-        
-        # Update seen articles for this feed
-        seen_articles[feed_url] = new_seen_articles + seen_articles[feed_url]
+        new_seen_articles.append(link)
 
-        # Limit the number of seen articles per feed
-        seen_articles[feed_url] = seen_articles[feed_url][:max_articles_per_feed]
+    # Prepend the new links and drop the oldest ones, building a single new list
+    seen = new_seen_articles
+    seen.extend(islice(seen_list, max_articles_per_feed - len(new_seen_articles)))
+    new_feed_state = {
+        "seen": seen,
+        "etag": response_headers.get("ETag"),
+        "modified": response_headers.get("Last-Modified"),
+        "digest": digest,
+    }
+    return feed_url, articles, new_feed_state
+
+def _process_feed(feed_url, feed_state, max_articles_per_feed):
+    """
+    Fetch and parse a single RSS feed and collect the entries we haven't seen yet.
+    Runs in a worker thread, so it must not touch shared state; the caller merges
+    the returned (feed_url, new_articles, new_feed_state) tuple.
+    """
+    try:
+        response = _SESSION.get(feed_url, headers=_conditional_headers(feed_state), timeout=10)
+        if response.status_code == 304:
+            return feed_url, [], feed_state
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logging.error(f"Could not fetch feed {feed_url}: {e}")
+        return feed_url, [], feed_state
+
+    return _parse_feed(
+        feed_url, feed_state, response.content, response.headers, max_articles_per_feed
+    )
+
+def _collect_articles(feed_urls, articles_per_feed):
+    """Concatenate the new articles in the order of the feeds file, so the output order is stable."""
+    articles = []
+    for feed_url in feed_urls:
+        articles.extend(articles_per_feed.get(feed_url, []))
+    return articles
+
+def _pending_reading_times(articles):
+    """
+    Group the articles without a reading time by link, so a page that several entries
+    link to is fetched only once. Returns {link: [index, ...]}.
+    """
+    pending = {}
+    for i, article in enumerate(articles):
+        if article["reading_time"] is None:
+            pending.setdefault(article["link"], []).append(i)
+    return pending
+
+def _store_reading_times(articles, pending, fetched):
+    """Set the fetched reading times, in the order of pending, on the articles."""
+    for indices, reading_time in zip(pending.values(), fetched):
+        for i in indices:
+            articles[i]["reading_time"] = reading_time
+
+def fetch_rss_articles(feed_urls, seen_articles, max_articles_per_feed):
+    """
+    Fetch articles from multiple RSS feeds and filter out those that are already seen.
+    Each feed is tracked separately. We rotate out the oldest link if we exceed the max size.
+    Feeds are fetched concurrently; results are merged back on the calling thread.
+    """
+
+    # Drop duplicate feeds, they would otherwise be processed twice in parallel
+    feed_urls = list(dict.fromkeys(feed_urls))
+    if not feed_urls:
+        return [], seen_articles
+
+    articles_per_feed = {}
+    with ThreadPoolExecutor(max_workers=min(32, len(feed_urls))) as executor:
+        futures = {
+            executor.submit(_process_feed, u, _feed_state(seen_articles.get(u)), max_articles_per_feed): u
+            for u in feed_urls
+        }
+        for future in as_completed(futures):
+            feed_url, new_articles, new_feed_state = future.result()
+            articles_per_feed[feed_url] = new_articles
+            seen_articles[feed_url] = new_feed_state
+
+    articles = _collect_articles(feed_urls, articles_per_feed)
+
+    # Articles without inline content need their page fetched to estimate the reading time
+    pending = _pending_reading_times(articles)
+    if pending:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            fetched = executor.map(get_reading_time_from_url, pending)
+            _store_reading_times(articles, pending, fetched)
 
     return articles, seen_articles
 
+def create_client_session():
+    """Create the aiohttp session shared by all requests of a run."""
+    connector = aiohttp.TCPConnector(limit_per_host=64)
+    # trust_env honours HTTP(S)_PROXY and friends, like requests does on the thread path
+    return aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT}, trust_env=True)
+
+async def _fetch_feed_async(session, feed_url, feed_state):
+    """Download a feed with a conditional GET. Returns (None, None) if it is unchanged."""
+    async with session.get(
+        feed_url, headers=_conditional_headers(feed_state), timeout=aiohttp.ClientTimeout(total=10)
+    ) as response:
+        if response.status == 304:
+            return None, None
+        response.raise_for_status()
+        return await response.read(), response.headers
+
+async def _get_reading_time_from_url_async(session, url):
+    """Like get_reading_time_from_url, but on an aiohttp session."""
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            counter = _StreamingWordCount()
+            async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+                if counter.feed(chunk):
+                    break
+        return counter.reading_time()
+    except Exception:
+        return "Unknown"
+
+async def _process_feed_async(session, feed_url, feed_state, max_articles_per_feed, reading_time_tasks):
+    """
+    Like _process_feed, but on an aiohttp session. The reading-time pages of the
+    feed's new articles are fetched right away, while other feeds are still downloading.
+    reading_time_tasks maps the links of pages being fetched to their task and is shared
+    by all feeds, so a page linked from several feeds is fetched only once.
+    """
+    feed_bytes, response_headers = await _fetch_feed_async(session, feed_url, feed_state)
+    if feed_bytes is None:
+        return feed_url, [], feed_state
+
+    _, articles, new_feed_state = _parse_feed(
+        feed_url, feed_state, feed_bytes, response_headers, max_articles_per_feed
+    )
+
+    pending = _pending_reading_times(articles)
+    for link in pending:
+        if link not in reading_time_tasks:
+            reading_time_tasks[link] = asyncio.ensure_future(_get_reading_time_from_url_async(session, link))
+    fetched = await asyncio.gather(*(reading_time_tasks[link] for link in pending))
+    _store_reading_times(articles, pending, fetched)
+
+    return feed_url, articles, new_feed_state
+
+async def fetch_rss_articles_async(session, feed_urls, seen_articles, max_articles_per_feed):
+    """
+    Like fetch_rss_articles, but all feeds and their reading-time pages are
+    downloaded concurrently on the given aiohttp session.
+    """
+    feed_urls = list(dict.fromkeys(feed_urls))
+    feed_states = {u: _feed_state(seen_articles.get(u)) for u in feed_urls}
+    reading_time_tasks = {}
+
+    # A failing feed must not take the others down, so exceptions are returned, not raised
+    results = await asyncio.gather(
+        *(_process_feed_async(session, u, feed_states[u], max_articles_per_feed, reading_time_tasks) for u in feed_urls),
+        return_exceptions=True,
+    )
+
+    articles_per_feed = {}
+    for feed_url, result in zip(feed_urls, results):
+        if isinstance(result, Exception):
+            # Some errors, like timeouts, have an empty message
+            logging.error(f"Could not fetch feed {feed_url}: {str(result) or type(result).__name__}")
+            seen_articles[feed_url] = feed_states[feed_url]
+            continue
+        _, new_articles, new_feed_state = result
+        articles_per_feed[feed_url] = new_articles
+        seen_articles[feed_url] = new_feed_state
+
+    return _collect_articles(feed_urls, articles_per_feed), seen_articles
+
+def _get_cleaner():
+    """Return this thread's bleach Cleaner, building it on first use."""
+    cleaner = getattr(_CLEANER, "cleaner", None)
+    if cleaner is None:
+        cleaner = bleach.sanitizer.Cleaner(
+            tags=ALLOWED_TAGS,
+            attributes=ALLOWED_ATTRIBUTES,
+            protocols=ALLOWED_PROTOCOLS,
+            strip=True  # remove disallowed tags entirely
+        )
+        _CLEANER.cleaner = cleaner
+    return cleaner
+
 def sanitize_html(input_html: str) -> str:
     """
     Sanitize the given HTML string, allowing only a limited set of tags, 
     attributes, and protocols.
     """
-    return bleach.clean(
-        input_html,
-        tags=ALLOWED_TAGS,
-        attributes=ALLOWED_ATTRIBUTES,
-        protocols=ALLOWED_PROTOCOLS,
-        strip=True  # remove disallowed tags entirely
-    )
+    if not input_html or not input_html.strip():
+        return ""
+    return _get_cleaner().clean(input_html)
 
 def format_email_content(article):
     """Format the email body content."""
     # We escape certain fields that should remain plain text:
     title_html = html.escape(article['title'])
     author_html = html.escape(article['author'])
-    
+
     # We sanitize content HTML, as we want some formatting here
-    content_html = ""
-    if article.get('content'):
-        content_html = sanitize_html(article['content'])
-
-    content = f"<h2>{title_html}</h2>"
-    content += f"<p><b>Author:</b> {author_html}<br>"
-    content += f"<a href='{article['link']}'>{article['link']}</a><br>"
-    content += f"<i>Estimated Reading Time: {article['reading_time']} min</i></p>"
-    if article['content']:
-        content += f"<div>{content_html}</div>"
-    return content
+    content_html = sanitize_html(article.get('content'))
+
+    return _EMAIL_TEMPLATE.format_map({
+        'title': title_html,
+        'author': author_html,
+        'link': article['link'],
+        'rt': article['reading_time'],
+        'body': _EMAIL_BODY(content_html) if content_html else "",
+    })
 
 def build_email(to_email, from_email, article):
     """Build the email message."""
@@ -166,6 +690,17 @@ def build_email(to_email, from_email, article):
     msg.attach(MIMEText(email_content, 'html'))
     return msg
 
+def build_digest_email(to_email, from_email, articles):
+    """Build a single email message containing all articles."""
+    msg = MIMEMultipart()
+    msg['From'] = f"RSS to Email <{from_email}>"
+    msg['To'] = to_email
+    msg['Subject'] = f"{len(articles)} new articles" if len(articles) > 1 else articles[0]['title']
+
+    email_content = "<hr>".join(format_email_content(article) for article in articles)
+    msg.attach(MIMEText(email_content, 'html'))
+    return msg
+
 def obtain_gmail_credentials(credentials_file):
     """Obtain Gmail API credentials interactively."""
     flow = InstalledAppFlow.from_client_secrets_file(
@@ -174,11 +709,8 @@ def obtain_gmail_credentials(credentials_file):
     creds = flow.run_local_server(port=0)
     return creds
 
-def send_email_with_gmail_api(to_email, from_email, article, credentials_file, token_file):
-    """
-    Send an email via the Gmail API using OAuth 2.0.
-    """
-    # 1) Load / refresh credentials
+def load_gmail_credentials(credentials_file, token_file):
+    """Load the Gmail API credentials from token_file, refreshing or obtaining them if needed."""
     creds = None
     if os.path.exists(token_file):
         creds = Credentials.from_authorized_user_file(token_file, SCOPES)
@@ -190,32 +722,225 @@ def send_email_with_gmail_api(to_email, from_email, article, credentials_file, t
         # Save the credentials for the next run
         with open(token_file, 'w') as token:
             token.write(creds.to_json())
+    return creds
+
+@functools.lru_cache(maxsize=1)
+def get_gmail_service(credentials_file, token_file):
+    """
+    Return the Gmail API service. Building it loads a large discovery document,
+    so it is done once and cached.
+    """
+    # Imported here, as only the --use_discovery path needs the API client
+    from googleapiclient.discovery import build
+
+    creds = load_gmail_credentials(credentials_file, token_file)
+    return build('gmail', 'v1', credentials=creds)
 
-    # 2) Build the Gmail API service
-    service = build('gmail', 'v1', credentials=creds)
+def _encode_raw(msg):
+    """Encode a message as the base64url string the Gmail API expects."""
+    return base64.urlsafe_b64encode(msg.as_bytes()).decode()
 
-    # 3) Build the email message
-    msg = build_email(to_email, from_email, article)
+def _email_builders(to_email, from_email, articles, digest=False):
+    """
+    Return a function building the message for each email to send: one per article,
+    or a single one combining all articles with digest.
+    """
+    if digest:
+        return [functools.partial(build_digest_email, to_email, from_email, articles)]
+    return [functools.partial(build_email, to_email, from_email, article) for article in articles]
+
+def _encode_articles(to_email, from_email, articles, digest=False):
+    """Build the messages for the articles and encode them for the Gmail API."""
+    # Sanitizing, serializing and encoding large messages takes a while, so do it in parallel.
+    # Article content is only sanitized while building emails, console output never pays for it.
+    def build_raw(build):
+        return _encode_raw(build())
 
-    # 4) Encode and send
-    raw = base64.urlsafe_b64encode(msg.as_bytes()).decode()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        return list(executor.map(build_raw, _email_builders(to_email, from_email, articles, digest=digest)))
+
+def build_send_request(service, raw):
+    """Build (but don't execute) the Gmail API request that sends the encoded message."""
     body = {'raw': raw}
+    return service.users().messages().send(userId='me', body=body)
 
-    try:
-        message_sent = service.users().messages().send(userId='me', body=body).execute()
-        logging.info(f"Email sent to {to_email}, Message ID: {message_sent['id']}")
-    except Exception as e:
-        logging.error(f"An error occurred while sending the email: {e}")
-
-def output_to_console(article):
-    """Print article information to the console."""
-    print("\nTitle:", article['title'])
-    print("Author:", article['author'])
-    print("Link:", article['link'])
-    print("Estimated Reading Time:", article['reading_time'], "min")
+def send_emails(service, to_email, from_email, articles, digest=False):
+    """
+    Send one email per article, or a single digest email, via the Gmail API.
+    Multiple sends are grouped into batch requests, so all articles share a few round-trips.
+    """
+    raws = _encode_articles(to_email, from_email, articles, digest=digest)
+
+    if len(raws) == 1:
+        try:
+            message_sent = build_send_request(service, raws[0]).execute()
+            logging.info(f"Email sent to {to_email}, Message ID: {message_sent['id']}")
+        except Exception as e:
+            logging.error(f"An error occurred while sending the email: {e}")
+        return
+
+    def on_sent(request_id, response, exception):
+        if exception is not None:
+            logging.error(f"An error occurred while sending the email: {exception}")
+        else:
+            logging.info(f"Email sent to {to_email}, Message ID: {response['id']}")
+
+    # Gmail accepts at most GMAIL_BATCH_SIZE requests per batch
+    for start in range(0, len(raws), GMAIL_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=on_sent)
+        for raw in raws[start:start + GMAIL_BATCH_SIZE]:
+            batch.add(build_send_request(service, raw))
+        try:
+            batch.execute()
+        except Exception as e:
+            logging.error(f"An error occurred while sending the emails: {e}")
+
+def _gmail_request_args(creds, raw):
+    """Return the headers and JSON body for posting an encoded message to the Gmail REST endpoint."""
+    headers = {
+        'Authorization': f'Bearer {creds.token}',
+        'Content-Type': 'application/json',
+    }
+    body = orjson.dumps({'raw': raw}) if orjson is not None else json.dumps({'raw': raw})
+    return headers, body
+
+# Serializes credential refreshes of concurrent sends
+_REFRESH_LOCK = threading.Lock()
+
+def _refresh_credentials(creds, stale_token=None):
+    """
+    Refresh the OAuth credentials over the shared HTTP session. With stale_token,
+    only refresh if no other send has replaced that token in the meantime.
+    """
+    with _REFRESH_LOCK:
+        if stale_token is None or creds.token == stale_token:
+            creds.refresh(Request(session=_SESSION))
+
+def _post_with_backoff(creds, raw):
+    """Post an encoded message, retrying with exponential backoff on rate limits and server errors."""
+    for attempt in range(GMAIL_MAX_RETRIES + 1):
+        headers, body = _gmail_request_args(creds, raw)
+        response = _SESSION.post(GMAIL_SEND_URL, headers=headers, data=body, timeout=30)
+        if response.status_code not in GMAIL_RETRY_STATUSES or attempt == GMAIL_MAX_RETRIES:
+            return response
+        time.sleep(2 ** attempt)
+
+def _send_via_rest(creds, raw):
+    """
+    Send an encoded message by posting it to the Gmail REST endpoint directly,
+    which spares us the discovery document of the API client.
+    """
+    token = creds.token
+    if creds.expired and creds.refresh_token:
+        # Concurrent sends all see the expired token, only the first one refreshes it
+        _refresh_credentials(creds, stale_token=token)
+        token = creds.token
+    response = _post_with_backoff(creds, raw)
+    if response.status_code == 401 and creds.refresh_token:
+        # The token was revoked or expired during the run, refresh it and retry once
+        _refresh_credentials(creds, stale_token=token)
+        response = _post_with_backoff(creds, raw)
+    response.raise_for_status()
+    return response.json()
+
+def send_emails_via_rest(creds, to_email, from_email, articles, concurrency=4, digest=False):
+    """
+    Send one email per article, or a single digest email, via the Gmail REST API, with
+    up to `concurrency` sends in flight. All sends share the credentials and the pooled HTTP session.
+    """
+    def build_and_send(build):
+        return _send_via_rest(creds, _encode_raw(build()))
+
+    # Each worker sends its message as soon as it is built, so the first emails
+    # are on their way while the later ones are still being sanitized and encoded
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(build_and_send, build)
+            for build in _email_builders(to_email, from_email, articles, digest=digest)
+        ]
+        for future in as_completed(futures):
+            try:
+                message_sent = future.result()
+                logging.info(f"Email sent to {to_email}, Message ID: {message_sent['id']}")
+            except Exception as e:
+                logging.error(f"An error occurred while sending the email: {e}")
+
+async def _send_via_rest_async(session, creds, raw):
+    """
+    Like _send_via_rest, but on an aiohttp session, and without the 401 handling.
+    Refresh the credentials beforehand.
+    """
+    for attempt in range(GMAIL_MAX_RETRIES + 1):
+        headers, body = _gmail_request_args(creds, raw)
+        async with session.post(
+            GMAIL_SEND_URL, headers=headers, data=body, timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status not in GMAIL_RETRY_STATUSES or attempt == GMAIL_MAX_RETRIES:
+                response.raise_for_status()
+                return await response.json()
+        await asyncio.sleep(2 ** attempt)
+
+def _is_unauthorized(result):
+    return isinstance(result, aiohttp.ClientResponseError) and result.status == 401
+
+async def send_emails_via_rest_async(session, creds, to_email, from_email, articles, concurrency=4, digest=False):
+    """
+    Send one email per article, or a single digest email, via the Gmail REST API,
+    with up to `concurrency` sends in flight.
+    """
+    # Refresh once up front rather than in every concurrent send
+    if creds.expired and creds.refresh_token:
+        _refresh_credentials(creds)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    builders = _email_builders(to_email, from_email, articles, digest=digest)
+    raws = [None] * len(builders)
+
+    async def send(i):
+        async with semaphore:
+            if raws[i] is None:
+                # Each message is built right before its send, in a worker thread so
+                # the event loop keeps the other sends going while it is sanitized and encoded
+                raws[i] = await asyncio.to_thread(lambda: _encode_raw(builders[i]()))
+            return await _send_via_rest_async(session, creds, raws[i])
+
+    results = await asyncio.gather(*(send(i) for i in range(len(builders))), return_exceptions=True)
+
+    # If the token was revoked or expired during the run, refresh it once and retry those sends
+    unauthorized = [i for i, result in enumerate(results) if _is_unauthorized(result)]
+    if unauthorized and creds.refresh_token:
+        _refresh_credentials(creds)
+        retried = await asyncio.gather(*(send(i) for i in unauthorized), return_exceptions=True)
+        for i, result in zip(unauthorized, retried):
+            results[i] = result
+
+    for result in results:
+        if isinstance(result, Exception):
+            logging.error(f"An error occurred while sending the email: {result}")
+        else:
+            logging.info(f"Email sent to {to_email}, Message ID: {result['id']}")
+
+def _console_lines(article):
+    """Yield the console output lines of an article."""
+    yield f"\nTitle: {article['title']}\n"
+    yield f"Author: {article['author']}\n"
+    yield f"Link: {article['link']}\n"
+    yield f"Estimated Reading Time: {article['reading_time']} min\n"
     if article['content']:
-        print("\nContent:\n", article['content'])
-    print("-" * 40)
+        yield f"\nContent:\n {article['content']}\n"
+    yield "-" * 40 + "\n"
+
+def output_to_console(articles):
+    """Print the information of all articles to the console with a single buffered write."""
+    sys.stdout.writelines(line for article in articles for line in _console_lines(article))
+    sys.stdout.flush()
+
+def positive_int(value):
+    """Parse a command line value that must be an integer of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 def load_rss_feeds(file_path):
     """Load RSS feed URLs from a text file."""
@@ -363,13 +1088,65 @@ def setup_mode(args):
         token_file.write(creds.to_json())
     print("token.json created successfully. Setup is complete.")
 
+def save_and_output(args, articles, seen_articles, app_data_dir):
+    """
+    Save the state of the run and output the new articles. Emails sent via the REST
+    endpoint are left to the caller, which sends them on its own HTTP stack: for
+    those the Gmail credentials are returned, otherwise None.
+    """
+    # Save updated seen articles dictionary
+    save_seen_articles(seen_articles, app_data_dir / "seen_articles.json", pretty=args.debug)
+
+    if not articles:
+        return None
+    if args.output == "console":
+        output_to_console(articles)
+        return None
+
+    token_file = app_data_dir / "token.json"
+    if args.use_discovery:
+        service = get_gmail_service(args.credentials, token_file)
+        send_emails(service, args.to_email, args.from_email, articles, digest=args.digest)
+        return None
+    return load_gmail_credentials(args.credentials, token_file)
+
+def main(args, feed_urls, seen_articles, app_data_dir):
+    """Fetch new articles and output them, using thread pools for the HTTP requests."""
+    # Fetch new articles, marking them as seen in the dictionary
+    articles, seen_articles = fetch_rss_articles(feed_urls, seen_articles, args.max_articles)
+
+    creds = save_and_output(args, articles, seen_articles, app_data_dir)
+    if creds is not None:
+        send_emails_via_rest(
+            creds, args.to_email, args.from_email, articles,
+            concurrency=args.send_concurrency, digest=args.digest,
+        )
+
+async def main_async(args, feed_urls, seen_articles, app_data_dir):
+    """
+    Like main, but all HTTP requests of a stage (feeds, reading-time pages, Gmail sends)
+    run concurrently on a single aiohttp session. Used when aiohttp is installed.
+    """
+    async with create_client_session() as session:
+        # Fetch new articles, marking them as seen in the dictionary
+        articles, seen_articles = await fetch_rss_articles_async(
+            session, feed_urls, seen_articles, args.max_articles
+        )
+
+        creds = save_and_output(args, articles, seen_articles, app_data_dir)
+        if creds is not None:
+            await send_emails_via_rest_async(
+                session, creds, args.to_email, args.from_email, articles,
+                concurrency=args.send_concurrency, digest=args.digest,
+            )
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Fetch RSS articles and output via email, console, or file.")
     parser.add_argument("feeds", type=str,
                         help="Path to a text file containing RSS feed URLs")
     parser.add_argument("--output", choices=["email", "console"], default="console",
                         help="Output format: email or console (default: console)")
-    parser.add_argument("--max_articles", type=int, default=1,
+    parser.add_argument("--max_articles", type=positive_int, default=1,
                         help="Maximum number of links to store and send per feed (default: 1)")
     parser.add_argument("--credentials", type=str, default="credentials.json",
                         help="Path to a Gmail API credentials file, i.e. OAuth client ID JSON file")
@@ -384,6 +1161,16 @@ if __name__ == "__main__":
                         help="Path to this script (if generating a launchd plist).")
     parser.add_argument("--app_data_dir", type=str, required=True,
                         help="Path to the directory where the app data is stored.")
+    parser.add_argument("--use_discovery", action="store_true",
+                        help="Send emails through the Google API client (discovery document and batch requests) instead of the Gmail REST endpoint.")
+    parser.add_argument("--digest", action="store_true",
+                        help="Send all new articles of a run in a single email instead of one email per article.")
+    parser.add_argument("--send_concurrency", type=positive_int, default=4,
+                        help="Maximum number of emails sent at the same time (default: 4)")
+    parser.add_argument("--use_threads", action="store_true",
+                        help="Run the HTTP requests in thread pools instead of on an asyncio event loop, even if aiohttp is installed.")
+    parser.add_argument("--debug", action="store_true",
+                        help="Enable debug logging and pretty-print the stored JSON files.")
 
     args = parser.parse_args()
 
@@ -403,24 +1190,14 @@ if __name__ == "__main__":
     if args.output == "email" and not args.from_email:
         parser.error("Sender email address is required when using email output mode")
 
-    logging.basicConfig(level=logging.INFO)
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
 
     RSS_FEEDS = load_rss_feeds(args.feeds)
     
     # Load the dictionary that keeps seen articles per feed
-    seen_articles_file = app_data_dir / "seen_articles.json"
-    seen_articles = load_seen_articles(seen_articles_file)
+    seen_articles = load_seen_articles(app_data_dir / "seen_articles.json")
 
-    # Fetch new articles, marking them as seen in the dictionary
-    articles, seen_articles = fetch_rss_articles(RSS_FEEDS, seen_articles, args.max_articles)
-
-    # Save updated seen articles dictionary
-    save_seen_articles(seen_articles, seen_articles_file)
-
-    if articles:
-        for article in articles:
-            if args.output == "email":
-                token_file = app_data_dir / "token.json"
-                send_email_with_gmail_api(args.to_email, args.from_email, article, args.credentials, token_file)
-            elif args.output == "console":
-                output_to_console(article)
+    if aiohttp is not None and not args.use_threads:
+        asyncio.run(main_async(args, RSS_FEEDS, seen_articles, app_data_dir))
+    else:
+        main(args, RSS_FEEDS, seen_articles, app_data_dir)